@@ -1,21 +1,24 @@
 """FastAPI dependencies for authentication and common concerns."""
 
-import secrets
+import hmac
 
 from fastapi import HTTPException, Security, status
 from fastapi.security import APIKeyHeader
 
-from config import CONFIG
+from config import get_config
 
 _api_key_header = APIKeyHeader(name="X-Api-Key", auto_error=False)
 
+# Encoded once at import so the per-request check is a plain byte compare.
+_EXPECTED_KEY: bytes = get_config().api.secret_key.encode("utf-8")
+
 
 async def verify_api_key(
     api_key: str | None = Security(_api_key_header),
 ) -> str:
     """Validate the X-Api-Key header against the configured secret.
 
-    Uses ``secrets.compare_digest`` to prevent timing-attack leaks.
+    Uses ``hmac.compare_digest`` on bytes to prevent timing-attack leaks.
 
     Raises:
         HTTPException 403: If the key is missing or invalid.
@@ -23,15 +26,15 @@ async def verify_api_key(
     Returns:
         The validated API key string.
     """
-    expected = CONFIG.api.secret_key
-    if not expected:
+    if not _EXPECTED_KEY:
         msg = "API_SECRET_KEY is not configured on the server."
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=msg,
         )
 
-    if api_key is None or not secrets.compare_digest(api_key, expected):
+    provided = (api_key or "").encode("utf-8", "replace")
+    if api_key is None or not hmac.compare_digest(provided, _EXPECTED_KEY):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Invalid or missing API key.",
@@ -1,11 +1,14 @@
 """API routes for the exam extraction pipeline."""
 
 import asyncio
+import io
 import logging
+import os
 import shutil
 import tempfile
+from collections.abc import Coroutine
 from pathlib import Path
-from typing import Annotated
+from typing import Annotated, Any
 
 from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
 
@@ -19,22 +22,74 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
-_ALLOWED_CONTENT_TYPES = frozenset(
-    {"application/pdf", "application/octet-stream"}
-)
+# A two-item tuple is cheaper to probe than a frozenset (no hashing).
+_ALLOWED_CONTENT_TYPES = ("application/pdf", "application/octet-stream")
+_INVALID_PDF_DETAIL = "{label} must be a PDF file (got {content_type})."
 
 
 def _validate_pdf(upload: UploadFile, label: str) -> None:
     """Raise 422 if the upload does not look like a PDF."""
-    if upload.content_type not in _ALLOWED_CONTENT_TYPES:
-        msg = f"{label} must be a PDF file (got {upload.content_type})."
+    content_type = upload.content_type
+    if content_type not in _ALLOWED_CONTENT_TYPES:
+        msg = _INVALID_PDF_DETAIL.format(
+            label=label, content_type=content_type
+        )
         raise HTTPException(status_code=422, detail=msg)
 
 
+_UPLOAD_CHUNK_SIZE = 1 << 20  # 1 MiB
+
+
+def _sendfile(src_fd: int, dst_fd: int) -> None:
+    """Copy *src_fd* into *dst_fd* inside the kernel with ``os.sendfile``."""
+    offset = 0
+    while sent := os.sendfile(dst_fd, src_fd, offset, _UPLOAD_CHUNK_SIZE):
+        offset += sent
+
+
+def _copy_upload(upload: UploadFile, dest: Path) -> None:
+    """Stream the spooled upload to *dest* in fixed-size chunks.
+
+    Uploads still spooled in memory are rolled over to disk first, so the
+    bytes can be copied with ``os.sendfile`` without passing through
+    userspace. File objects without a descriptor (and platforms without
+    ``sendfile``) fall back to ``copyfileobj``.
+    """
+    src = upload.file
+    if isinstance(src, tempfile.SpooledTemporaryFile):
+        src.rollover()
+    src.seek(0)
+
+    with dest.open("wb") as fp:
+        if hasattr(os, "sendfile"):
+            try:
+                _sendfile(src.fileno(), fp.fileno())
+            except (OSError, io.UnsupportedOperation):
+                logger.debug("sendfile unavailable, falling back to copy")
+                src.seek(0)
+                fp.seek(0)
+                fp.truncate()
+            else:
+                return
+
+        shutil.copyfileobj(src, fp, length=_UPLOAD_CHUNK_SIZE)
+
+
 async def _save_upload(upload: UploadFile, dest: Path) -> None:
     """Persist an UploadFile to *dest* asynchronously."""
-    content = await upload.read()
-    await asyncio.to_thread(dest.write_bytes, content)
+    await asyncio.to_thread(_copy_upload, upload, dest)
+
+
+async def _save_uploads(saves: list[Coroutine[Any, Any, None]]) -> None:
+    """Run the upload copies concurrently and wait for all of them.
+
+    Every copy finishes before the first error is re-raised, so the
+    caller's temporary directory is never removed while one is writing.
+    """
+    results = await asyncio.gather(*saves, return_exceptions=True)
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
 
 
 @router.post(
@@ -62,42 +117,45 @@ async def process_exam(
     if answer_key_pdf is not None:
         _validate_pdf(answer_key_pdf, "answer_key_pdf")
 
-    temp_dir = Path(tempfile.mkdtemp(prefix="exam_pipeline_"))
-    try:
-        exam_path = temp_dir / "exam.pdf"
-        await _save_upload(exam_pdf, exam_path)
-
-        answer_key_path: Path | None = None
-        if answer_key_pdf is not None:
-            answer_key_path = temp_dir / "answer_key.pdf"
-            await _save_upload(answer_key_pdf, answer_key_path)
-
-        images_dir = temp_dir / "images"
-        images_dir.mkdir()
-
-        logger.info(
-            "Starting pipeline - exam=%s answer_key=%s",
-            exam_path,
-            answer_key_path,
-        )
-
-        exam = await run_pipeline(
-            exam_pdf_path=exam_path,
-            answer_key_pdf_path=answer_key_path,
-            images_output_dir=images_dir,
-        )
-
-        exam_response: ExamResponse = build_exam_response(exam, images_dir)
-
-        return ProcessingResponse(status="success", data=exam_response)
-
-    except Exception:
-        logger.exception("Pipeline failed")
-        raise
-
-    finally:
-        shutil.rmtree(temp_dir, ignore_errors=True)
-        logger.info("Cleaned up temp dir %s", temp_dir)
+    with tempfile.TemporaryDirectory(
+        prefix="exam_pipeline_",
+        dir=CONFIG.api.upload_temp_dir,
+        ignore_cleanup_errors=True,
+    ) as temp_name:
+        temp_dir = Path(temp_name)
+        try:
+            exam_path = temp_dir / "exam.pdf"
+            saves = [_save_upload(exam_pdf, exam_path)]
+
+            answer_key_path: Path | None = None
+            if answer_key_pdf is not None:
+                answer_key_path = temp_dir / "answer_key.pdf"
+                saves.append(_save_upload(answer_key_pdf, answer_key_path))
+
+            await _save_uploads(saves)
+
+            images_dir = temp_dir / "images"
+            images_dir.mkdir()
+
+            logger.info(
+                "Starting pipeline - exam=%s answer_key=%s",
+                exam_path,
+                answer_key_path,
+            )
+
+            exam = await run_pipeline(
+                exam_pdf_path=exam_path,
+                answer_key_pdf_path=answer_key_path,
+                images_output_dir=images_dir,
+            )
+
+            exam_response: ExamResponse = build_exam_response(exam, images_dir)
+
+            return ProcessingResponse(status="success", data=exam_response)
+
+        except Exception:
+            logger.exception("Pipeline failed")
+            raise
 
 
 @router.get(
@@ -5,7 +5,9 @@ making them easy to modify and maintain.
 """
 
 import os
+from collections.abc import Mapping
 from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
 
 
@@ -59,21 +61,29 @@ class LLMConfig:
     max_retries: int = 3
     retry_base_delay: float = 2.0
 
-    def __post_init__(self) -> None:
-        """Override with environment variables if set."""
-        self.model_name = os.getenv("LLM_MODEL", self.model_name)
-        env_temp = os.getenv("LLM_TEMPERATURE", self.temperature)
-        self.temperature = float(env_temp)
-        env_max = os.getenv(
-            "MAX_CONCURRENT_REQUESTS", self.max_concurrent_requests
+    @classmethod
+    def from_env(cls, env: Mapping[str, str] = os.environ) -> "LLMConfig":
+        """Build the config, overriding defaults with environment variables."""
+        defaults = cls()
+        return cls(
+            model_name=env.get("LLM_MODEL", defaults.model_name),
+            temperature=float(
+                env.get("LLM_TEMPERATURE", defaults.temperature)
+            ),
+            max_concurrent_requests=int(
+                env.get(
+                    "MAX_CONCURRENT_REQUESTS",
+                    defaults.max_concurrent_requests,
+                )
+            ),
+            requests_per_minute=int(
+                env.get("LLM_RPM", defaults.requests_per_minute)
+            ),
+            max_retries=int(env.get("LLM_MAX_RETRIES", defaults.max_retries)),
+            retry_base_delay=float(
+                env.get("LLM_RETRY_BASE_DELAY", defaults.retry_base_delay)
+            ),
         )
-        self.max_concurrent_requests = int(env_max)
-        env_rpm = os.getenv("LLM_RPM", self.requests_per_minute)
-        self.requests_per_minute = int(env_rpm)
-        env_retries = os.getenv("LLM_MAX_RETRIES", self.max_retries)
-        self.max_retries = int(env_retries)
-        env_delay = os.getenv("LLM_RETRY_BASE_DELAY", self.retry_base_delay)
-        self.retry_base_delay = float(env_delay)
 
 
 @dataclass
@@ -82,6 +92,7 @@ class QuestionConfig:
 
     # Regex patterns
     question_split_pattern: str = r"(QUESTÃO\s+\d+)"
+    question_number_pattern: str = r"QUESTÃO\s+(\d+)"
     normalize_pattern: str = r"(\d+)"
     clean_pattern: str = r"(?i)(.+?)(?:\s?\1){3,}"
 
@@ -95,15 +106,22 @@ class APIConfig:
 
     secret_key: str = ""
     allowed_origins: list[str] = field(default_factory=list)
-
-    def __post_init__(self) -> None:
-        """Override with environment variables if set."""
-        self.secret_key = os.getenv("API_SECRET_KEY", self.secret_key)
-        origins = os.getenv("ALLOWED_ORIGINS", "")
+    # Parent directory for per-request files; None uses the system default
+    upload_temp_dir: str | None = None
+
+    @classmethod
+    def from_env(cls, env: Mapping[str, str] = os.environ) -> "APIConfig":
+        """Build the config, overriding defaults with environment variables."""
+        config = cls(
+            secret_key=env.get("API_SECRET_KEY", cls.secret_key),
+            upload_temp_dir=env.get("UPLOAD_TEMP_DIR") or None,
+        )
+        origins = env.get("ALLOWED_ORIGINS", "")
         if origins:
-            self.allowed_origins = [
+            config.allowed_origins = [
                 o.strip() for o in origins.split(",") if o.strip()
             ]
+        return config
 
 
 @dataclass
@@ -112,10 +130,20 @@ class AppConfig:
 
     image_filter: ImageFilterConfig = field(default_factory=ImageFilterConfig)
     paths: PathConfig = field(default_factory=PathConfig)
-    llm: LLMConfig = field(default_factory=LLMConfig)
+    llm: LLMConfig = field(default_factory=LLMConfig.from_env)
     question: QuestionConfig = field(default_factory=QuestionConfig)
-    api: APIConfig = field(default_factory=APIConfig)
+    api: APIConfig = field(default_factory=APIConfig.from_env)
+
+
+@lru_cache(maxsize=1)
+def get_config() -> AppConfig:
+    """Build the application configuration once and reuse it.
+
+    Environment variables are only read on the first call; later calls
+    return the cached instance.
+    """
+    return AppConfig()
 
 
 # Global configuration instance
-CONFIG = AppConfig()
+CONFIG = get_config()
@@ -1,41 +1,33 @@
+import bisect
 import re
+from collections import Counter
 from pathlib import Path
 from typing import Any, cast
 
 import fitz
-from fitz import Page
 
 from config import CONFIG
 from extractors.image_extractor import PDFImageExtractor
 from extractors.text_extractor import PDFTextExtractor
 
+# Matches a question header and captures its number in group 1
+_QUESTION_RE = re.compile(
+    CONFIG.question.question_number_pattern, re.IGNORECASE
+)
+
+# Block type reported by page.get_text("blocks") for text (1 is image)
+_TEXT_BLOCK = 0
+
 
 class ExamExtractor:
     def __init__(self) -> None:
         self.text_extractor = PDFTextExtractor()
         self.image_extractor = PDFImageExtractor()
-        self.question_pattern = re.compile(
-            CONFIG.question.question_split_pattern, re.IGNORECASE
-        )
-
-    def extract_content(
-        self,
-        exam_pdf_path: Path,
-        answer_key_pdf_path: Path | None,
-        images_output_dir: Path,
-    ) -> dict[str, Any]:
-        return {
-            "text": self.extract_exam_text(exam_pdf_path, answer_key_pdf_path),
-            "images_map": self.map_images_to_questions(
-                exam_pdf_path,
-                images_output_dir,
-            ),
-        }
 
     def map_questions(
         self,
         question_map: dict[str, list[str]],
-        page: Page,
+        blocks: list[tuple[Any, ...]],
     ) -> list[tuple[str, float]]:
         """Extract question identifiers from a PDF page and populate
         question_map.
@@ -47,7 +39,8 @@ class ExamExtractor:
         Args:
             question_map: Dictionary to populate with question names as keys
             and empty lists as values. Modified in-place.
-            page: The PDF page to extract questions from.
+            blocks: The page blocks as returned by
+            ``page.get_text("blocks")``, parsed once by the caller.
 
         Returns:
             List of tuples containing (question_name, y_position) sorted by
@@ -55,23 +48,17 @@ class ExamExtractor:
             Example: [('QUESTÃO 01', 120.5), ('QUESTÃO 02', 350.8)]
         """
 
-        text_dict = cast("dict[str, Any]", page.get_text("dict"))
-        text_blocks = text_dict["blocks"]
-        questions = []
-
-        for block in text_blocks:
-            if "lines" in block:
-                for line in block["lines"]:
-                    for span in line["spans"]:
-                        match = self.question_pattern.search(span["text"])
-                        if match:
-                            digit_match = re.search(r"\d+", match.group(1))
-                            if digit_match:
-                                q_num = int(digit_match.group())
-                                q_name = f"QUESTÃO {q_num:02d}"
-                                questions.append((q_name, block["bbox"][1]))
-                                if q_name not in question_map:
-                                    question_map[q_name] = []
+        questions: list[tuple[str, float]] = []
+        append = questions.append
+        find_questions = _QUESTION_RE.finditer
+
+        for _, block_y, _, _, text, _, block_type in blocks:
+            if block_type != _TEXT_BLOCK:
+                continue
+            for match in find_questions(text):
+                q_name = f"QUESTÃO {int(match.group(1)):02d}"
+                append((q_name, block_y))
+                question_map.setdefault(q_name, [])
 
         questions.sort(key=lambda x: x[1])
 
@@ -90,51 +77,74 @@ class ExamExtractor:
             Dictionary mapping question identifiers to image paths
             Example: {'QUESTÃO 01': ['QUESTÃO 01_img3.jpeg'], 'QUESTÃO 02': []}
         """
-        doc = fitz.open(pdf_path)
         question_map = {}
         output_dir.mkdir(parents=True, exist_ok=True)
-        image_counts = self.image_extractor.count_image_occurrences(doc)
 
-        for page in doc.pages():
-            questions = self.map_questions(question_map, page)
-            if not questions:
-                continue
+        # Occurrence counts are gathered during the mapping pass; images are
+        # only extracted and filtered once every page has been counted.
+        image_counts: Counter[int] = Counter()
+        candidates: list[tuple[int, str]] = []
+        digests: dict[int, bytes] = {}
 
-            images = page.get_images(full=True)
-            for img in images:
-                xref = img[0]
-                img_rects = page.get_image_rects(xref)
-
-                if not img_rects:
-                    continue
-
-                img_y = img_rects[0].y0
-
-                current_question = None
-                for i, (q_name, q_y) in enumerate(questions):
-                    if i + 1 < len(questions):
-                        next_q_y = questions[i + 1][1]
-                    else:
-                        next_q_y = float("inf")
-
-                    if q_y <= img_y < next_q_y:
-                        current_question = q_name
-                        break
+        with fitz.open(pdf_path) as doc:
+            for page in doc.pages():
+                image_counts.update(
+                    img[0] for img in page.get_images(full=True)
+                )
 
-                if not current_question:
+                blocks = cast("list[tuple[Any, ...]]", page.get_text("blocks"))
+                questions = self.map_questions(question_map, blocks)
+                if not questions:
                     continue
 
-                img_filename = self.image_extractor.extract_and_filter_image(
-                    doc, xref, image_counts, current_question, output_dir
-                )
+                question_ys = [q_y for _, q_y in questions]
+                question_names = [q_name for q_name, _ in questions]
+
+                # Yields every placement with its bbox. To match placements
+                # to xrefs, PyMuPDF decodes each image on the page into a
+                # Pixmap and compares MD5 digests of the pixels; that digest
+                # is kept so the filters can recognise duplicate figures.
+                # An image drawn several times is mapped by its first
+                # placement. Inline images have xref 0 and cannot be
+                # extracted.
+                seen_xrefs: set[int] = set()
+                for info in page.get_image_info(xrefs=True):
+                    xref = info["xref"]
+                    if not xref or xref in seen_xrefs:
+                        continue
+                    seen_xrefs.add(xref)
+                    digests[xref] = info["digest"]
+
+                    img_y = info["bbox"][1]
+
+                    # Questions are sorted by y, so the enclosing question is
+                    # the last one starting at or above the image.
+                    idx = bisect.bisect_right(question_ys, img_y) - 1
+                    if idx < 0:
+                        continue
+                    candidates.append((xref, question_names[idx]))
+
+        # Only images that can survive the repetition filter are worth
+        # extracting, and an image repeated under the same question would
+        # produce the same file, so each (xref, question) pair is kept once.
+        max_repetitions = self.image_extractor.filter_config.max_repetitions
+        candidates = [
+            (xref, question)
+            for xref, question in dict.fromkeys(candidates)
+            if image_counts[xref] <= max_repetitions
+        ]
+        filenames = self.image_extractor.extract_and_filter_images(
+            pdf_path, candidates, image_counts, output_dir, digests
+        )
 
-                if (
-                    img_filename
-                    and img_filename not in question_map[current_question]
-                ):
-                    question_map[current_question].append(img_filename)
+        # Filenames embed the question and xref, and candidates are unique
+        # per pair, so no membership check is needed before appending.
+        for (_, current_question), img_filename in zip(
+            candidates, filenames, strict=True
+        ):
+            if img_filename:
+                question_map[current_question].append(img_filename)
 
-        doc.close()
         return question_map
 
     def extract_exam_text(
@@ -165,6 +175,6 @@ class ExamExtractor:
             answer_key_text = self.text_extractor.extract_text(
                 pdf_path=answer_key_pdf_path
             )
-            exam_text += answer_key_separator + answer_key_text
+            exam_text = f"{exam_text}{answer_key_separator}{answer_key_text}"
 
         return exam_text
@@ -5,10 +5,16 @@ with configurable quality filters and question mapping.
 """
 
 import logging
-import re
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
 from io import BytesIO
 from pathlib import Path
 
+import fitz
 from fitz import Document
 from PIL import Image
 
@@ -16,67 +22,136 @@ from config import CONFIG, ImageFilterConfig
 
 logger = logging.getLogger(__name__)
 
+# Images are downscaled to this size before counting unique colors
+_COLOR_SAMPLE_SIZE = (128, 128)
+
+# Below this many candidate images, the images are decoded inline. With a
+# warm pool a round trip costs about 2 ms, roughly one image's decode and
+# filter, so the split only pays once each worker gets a few images.
+_MIN_IMAGES_FOR_POOL = 8
+
+# Guards starting, replacing and shutting down the shared pool, which
+# may happen from several request threads at once.
+_pool_lock = threading.Lock()
+
+
+@lru_cache(maxsize=1)
+def _start_pool() -> ProcessPoolExecutor:
+    """Start the worker pool shared by every request.
+
+    Workers are started once, so the interpreter start and the fitz/PIL
+    imports are paid on first use only.
+    """
+    # "spawn" avoids forking a process that is running other threads.
+    return ProcessPoolExecutor(
+        os.process_cpu_count() or 1,
+        mp_context=multiprocessing.get_context("spawn"),
+    )
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    """Return the shared worker pool, starting it on first use."""
+    with _pool_lock:
+        return _start_pool()
+
+
+def _discard_pool(pool: ProcessPoolExecutor) -> None:
+    """Drop a broken pool so the next call starts a fresh one.
+
+    The cache is only cleared if it still holds *pool*, so a request that
+    notices the breakage late does not discard a replacement started by
+    another request.
+    """
+    with _pool_lock:
+        if _start_pool.cache_info().currsize and _start_pool() is pool:
+            _start_pool.cache_clear()
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def shutdown_pool() -> None:
+    """Shut down the shared worker pool, if it was started."""
+    with _pool_lock:
+        if not _start_pool.cache_info().currsize:
+            return
+        pool = _start_pool()
+        _start_pool.cache_clear()
+    pool.shutdown()
+
+
+def _extract_batch(
+    filter_config: ImageFilterConfig,
+    pdf_path: Path,
+    batch: list[tuple[int, bytes | None, list[str]]],
+    image_counts: dict[int, int],
+    output_dir: Path,
+) -> list[list[str | None]]:
+    """Worker entry point: extract and filter a batch of images.
+
+    Each xref is decoded and filtered once, then saved for every question
+    it was mapped to.
+    """
+    extractor = PDFImageExtractor(filter_config)
+    results: list[list[str | None]] = []
+    decisions: dict[bytes, bool] = {}
+    with fitz.open(pdf_path) as doc:
+        for xref, digest, questions in batch:
+            loaded = extractor.load_filtered_image(
+                doc, xref, image_counts, decisions, digest
+            )
+            if loaded is None:
+                results.append([None] * len(questions))
+                continue
+            image_bytes, ext = loaded
+            results.append(
+                [
+                    extractor.save_question_image(
+                        image_bytes, ext, xref, question, output_dir
+                    )
+                    for question in questions
+                ]
+            )
+    return results
+
 
 class PDFImageExtractor:
     """Handles PDF image extraction with configurable filters."""
 
-    def __init__(self, filter_config: ImageFilterConfig | None = None) -> None:
+    def __init__(
+        self,
+        filter_config: ImageFilterConfig | None = None,
+        max_workers: int | None = None,
+    ) -> None:
         """Initialize the image extractor.
 
         Args:
             filter_config: Configuration for image quality filters.
                           If None, uses default from CONFIG.
+            max_workers: Number of batches the images are split into for
+                          the shared worker pool. If None, uses the CPUs
+                          available to this process.
         """
         self.filter_config = filter_config or CONFIG.image_filter
-        self.question_pattern = re.compile(
-            CONFIG.question.question_split_pattern, re.IGNORECASE
-        )
-
-    def count_image_occurrences(self, doc: Document) -> dict[int, int]:
-        """Count occurrences of each image in the PDF document.
-
-        Args:
-            doc: The PDF document.
-
-        Returns:
-            Dictionary mapping image xref to its occurrence count.
-        """
-        image_counts = {}
-
-        for page in doc.pages():
-            images = page.get_images(full=True)
-            for img in images:
-                xref = img[0]
-                image_counts[xref] = image_counts.get(xref, 0) + 1
-
-        return image_counts
+        self.max_workers = max_workers or os.process_cpu_count() or 1
 
-    def passes_filters(
+    def passes_size_filters(
         self,
-        image: Image.Image,
-        image_bytes: bytes,
-        xref: int,
-        image_counts: dict[int, int],
+        width: int,
+        height: int,
+        size_bytes: int,
     ) -> bool:
-        """Check if an image passes the defined quality filters.
+        """Check the filters that only need the image metadata.
 
         Args:
-            image: PIL Image object
-            image_bytes: Raw image bytes
-            xref: Image xref identifier
-            image_counts: Dictionary of image occurrence counts
+            width: Image width in pixels
+            height: Image height in pixels
+            size_bytes: Size of the raw image bytes
 
         Returns:
-            True if image passes all filters, False otherwise.
+            True if the image passes the size filters, False otherwise.
         """
-
-        if image_counts[xref] > self.filter_config.max_repetitions:
-            return False
-
-        if len(image_bytes) < self.filter_config.min_size_bytes:
+        if size_bytes < self.filter_config.min_size_bytes:
             return False
 
-        width, height = image.size
         if (
             width < self.filter_config.min_width
             or height < self.filter_config.min_height
@@ -84,19 +159,35 @@ class PDFImageExtractor:
             return False
 
         aspect_ratio = width / height
-        if (
-            aspect_ratio > self.filter_config.max_aspect_ratio
-            or aspect_ratio < self.filter_config.min_aspect_ratio
-        ):
-            return False
+        return (
+            self.filter_config.min_aspect_ratio
+            <= aspect_ratio
+            <= self.filter_config.max_aspect_ratio
+        )
 
-        image_rgb = image.convert("RGB")
-        colors = image_rgb.getcolors(maxcolors=10000)
-        if colors and len(colors) < self.filter_config.min_unique_colors:
-            return False
+    def passes_color_filters(self, image: Image.Image) -> bool:
+        """Check the filters that need decoded pixels.
+
+        The unique-color count is taken on a downscaled copy, which is
+        plenty to tell photos and figures apart from flat logos. The image
+        is reduced in place.
 
+        Args:
+            image: PIL Image object
+
+        Returns:
+            True if the image passes the color filters, False otherwise.
+        """
         # Check for palette mode with transparency (likely icon/logo)
-        return not (image.mode == "P" and "transparency" in image.info)
+        if image.mode == "P" and "transparency" in image.info:
+            return False
+
+        # getcolors returns None once the limit is exceeded, so capping it
+        # just above the threshold stops the count as soon as it passes.
+        min_colors = self.filter_config.min_unique_colors
+        image.thumbnail(_COLOR_SAMPLE_SIZE, Image.Resampling.NEAREST)
+        colors = image.convert("RGB").getcolors(maxcolors=min_colors + 1)
+        return colors is None or len(colors) >= min_colors
 
     def save_image(
         self,
@@ -106,50 +197,212 @@ class PDFImageExtractor:
     ) -> None:
         """Save image to the specified output path.
 
+        The output directory must already exist; callers create it once
+        before extracting a document's images.
+
         Args:
             image_bytes: Raw image bytes
             output_path: Directory to save the image
             filename: Name of the file to save
         """
-        output_path.mkdir(parents=True, exist_ok=True)
         file_path = output_path / filename
-        with file_path.open("wb") as f:
-            f.write(image_bytes)
+        fd = os.open(file_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            view = memoryview(image_bytes)
+            while view:
+                view = view[os.write(fd, view) :]
+        finally:
+            os.close(fd)
 
-    def extract_and_filter_image(
+    def load_filtered_image(
         self,
         doc: Document,
         xref: int,
         image_counts: dict[int, int],
-        current_question: str,
-        output_dir: Path,
-    ) -> str | None:
-        """Extract and filter a single image if it passes quality checks.
+        decisions: dict[bytes, bool] | None = None,
+        digest: bytes | None = None,
+    ) -> tuple[bytes, str] | None:
+        """Extract an image and run it through the quality filters.
 
         Args:
             doc: The PDF document
             xref: Image xref identifier
             image_counts: Dictionary of image occurrence counts
-            current_question: Question identifier this image belongs to
-            output_dir: Directory to save the image
+            decisions: Optional cache of color filter results keyed by
+                      pixel digest. The same figure is often embedded
+                      under several xrefs, and this lets it be decoded
+                      only once.
+            digest: The image's pixel digest, as reported by
+                      ``page.get_image_info``. The cache is only used when
+                      it is given.
 
         Returns:
-            Image filename if image was saved, None otherwise
+            Tuple of (image bytes, file extension) if the image passes,
+            None otherwise.
         """
+        # Cheapest checks first: repetitions need no extraction and size
+        # checks only need the metadata returned by extract_image.
+        if image_counts[xref] > self.filter_config.max_repetitions:
+            return None
+
         base_image = doc.extract_image(xref)
         image_bytes = base_image["image"]
 
+        if not self.passes_size_filters(
+            base_image["width"], base_image["height"], len(image_bytes)
+        ):
+            return None
+
+        cached = (
+            decisions.get(digest)
+            if decisions is not None and digest is not None
+            else None
+        )
+        if cached is not None:
+            return (image_bytes, base_image["ext"]) if cached else None
+
+        passed = False
         try:
             image = Image.open(BytesIO(image_bytes))
+            passed = self.passes_color_filters(image)
+        except Exception:
+            logger.exception("Error processing xref %d", xref)
 
-            if self.passes_filters(image, image_bytes, xref, image_counts):
-                img_filename = (
-                    f"{current_question}_img{xref}.{base_image['ext']}"
+        if decisions is not None and digest is not None:
+            decisions[digest] = passed
+        return (image_bytes, base_image["ext"]) if passed else None
+
+    def save_question_image(
+        self,
+        image_bytes: bytes,
+        ext: str,
+        xref: int,
+        current_question: str,
+        output_dir: Path,
+    ) -> str | None:
+        """Save an accepted image under its question-specific filename.
+
+        Args:
+            image_bytes: Raw image bytes
+            ext: Image file extension
+            xref: Image xref identifier
+            current_question: Question identifier this image belongs to
+            output_dir: Directory to save the image
+
+        Returns:
+            Image filename if image was saved, None otherwise
+        """
+        img_filename = f"{current_question}_img{xref}.{ext}"
+        try:
+            self.save_image(image_bytes, output_dir, img_filename)
+        except OSError:
+            logger.exception("Error saving xref %d", xref)
+            return None
+        return img_filename
+
+    def _extract_batches_in_pool(
+        self,
+        pdf_path: Path,
+        batches: list[list[tuple[int, bytes | None, list[str]]]],
+        image_counts: dict[int, int],
+        output_dir: Path,
+    ) -> list[list[list[str | None]]]:
+        """Run one _extract_batch per batch on the shared worker pool.
+
+        A worker that dies (a crash on a malformed image, an OOM kill)
+        breaks the whole pool. The broken pool is replaced and the batches
+        are retried once on the fresh one; if that breaks too, the error
+        is raised rather than decoding the suspect PDF in this process.
+        """
+        workers = len(batches)
+
+        def run(pool: ProcessPoolExecutor) -> list[list[list[str | None]]]:
+            return list(
+                pool.map(
+                    _extract_batch,
+                    [self.filter_config] * workers,
+                    [pdf_path] * workers,
+                    batches,
+                    [image_counts] * workers,
+                    [output_dir] * workers,
                 )
-                self.save_image(image_bytes, output_dir, img_filename)
-                return img_filename
+            )
 
-        except Exception:
-            logger.exception("Error processing xref %d", xref)
+        pool = _get_pool()
+        try:
+            return run(pool)
+        except BrokenProcessPool:
+            _discard_pool(pool)
+            logger.warning("Image worker pool broke; restarting it.")
+
+        pool = _get_pool()
+        try:
+            return run(pool)
+        except BrokenProcessPool:
+            _discard_pool(pool)
+            raise
+
+    def extract_and_filter_images(
+        self,
+        pdf_path: Path,
+        candidates: list[tuple[int, str]],
+        image_counts: dict[int, int],
+        output_dir: Path,
+        digests: dict[int, bytes] | None = None,
+    ) -> list[str | None]:
+        """Extract and filter many images, in parallel when worthwhile.
+
+        Candidates sharing an xref are decoded and filtered only once.
+        Decoding and color counting are CPU bound and hold the GIL, so large
+        batches are split across the shared worker pool, each batch opening
+        its own handle on the PDF.
 
-        return None
+        Args:
+            pdf_path: Path to the PDF file
+            candidates: (xref, question identifier) pairs to extract
+            image_counts: Dictionary of image occurrence counts
+            output_dir: Directory to save the images
+            digests: Optional pixel digest per xref, used to filter
+                      duplicate figures only once
+
+        Returns:
+            One entry per candidate, in order: the saved filename, or None
+            if the image was filtered out.
+        """
+        positions: dict[int, list[int]] = {}
+        questions: dict[int, list[str]] = {}
+        for index, (xref, question) in enumerate(candidates):
+            positions.setdefault(xref, []).append(index)
+            questions.setdefault(xref, []).append(question)
+        digests = digests or {}
+        items = [
+            (xref, digests.get(xref), xref_questions)
+            for xref, xref_questions in questions.items()
+        ]
+
+        workers = min(self.max_workers, len(items))
+        if workers <= 1 or len(items) < _MIN_IMAGES_FOR_POOL:
+            results = _extract_batch(
+                self.filter_config,
+                pdf_path,
+                items,
+                image_counts,
+                output_dir,
+            )
+        else:
+            batches = [items[i::workers] for i in range(workers)]
+            batch_results = self._extract_batches_in_pool(
+                pdf_path, batches, image_counts, output_dir
+            )
+            # Undo the round-robin split so results line up with items.
+            results = [[] for _ in items]
+            for offset, batch_result in enumerate(batch_results):
+                results[offset::workers] = batch_result
+
+        filenames: list[str | None] = [None] * len(candidates)
+        for (xref, _, _), xref_filenames in zip(items, results, strict=True):
+            for index, filename in zip(
+                positions[xref], xref_filenames, strict=True
+            ):
+                filenames[index] = filename
+        return filenames
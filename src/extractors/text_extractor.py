@@ -67,7 +67,7 @@ class PDFTextExtractor:
             msg = f"Not a PDF file: {pdf_path}"
             raise ValueError(msg)
 
-        text = ""
+        parts: list[str] = []
 
         with fitz.open(pdf_path) as pdf:
             total_pages = pdf.page_count
@@ -78,16 +78,17 @@ class PDFTextExtractor:
             if start >= end:
                 return ""
 
-            for page_num in range(start, end):
-                page = pdf[page_num]
+            for page_num, page in enumerate(
+                pdf.pages(start, end), start=start
+            ):
                 page_text = cast("str", page.get_text())
 
                 if page_marker is not None:
                     formatted_marker = page_marker.format(
                         page_num=page_num + 1
                     )
-                    text += f"{formatted_marker} {page_text}"
+                    parts.append(f"{formatted_marker} {page_text}")
                 else:
-                    text += page_text
+                    parts.append(page_text)
 
-        return text
+        return "".join(parts)
@@ -1,4 +1,6 @@
 import logging
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
@@ -6,6 +8,7 @@ from fastapi.responses import JSONResponse
 
 from api.routes import router as api_router
 from config import CONFIG
+from extractors.image_extractor import shutdown_pool
 from models.question import ProcessingResponse
 
 logging.basicConfig(
@@ -14,6 +17,14 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI) -> AsyncIterator[None]:
+    yield
+    # Stop the image worker processes with the server.
+    shutdown_pool()
+
+
 app = FastAPI(
     title="Exam Extraction API",
     description=(
@@ -21,6 +32,7 @@ app = FastAPI(
         "using LLM-powered pipelines."
     ),
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 
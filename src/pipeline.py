@@ -1,7 +1,9 @@
 import asyncio
 import logging
 import time
+from collections.abc import Callable
 from pathlib import Path
+from typing import Any
 
 from config import CONFIG
 from extractors.exam_extractor import ExamExtractor
@@ -11,12 +13,38 @@ from processors import (
     QuestionProcessor,
     TextProcessor,
 )
-from utils.file_operations import async_write_json
+from utils.file_operations import async_write_text
 from utils.llm import load_nvidia_model
 
 logger = logging.getLogger(__name__)
 
 
+async def _run_in_thread_to_completion[T](
+    func: Callable[..., T], *args: Any
+) -> T:
+    """Run *func* in a worker thread, waiting for it even if cancelled.
+
+    A thread cannot be interrupted, so a plain ``asyncio.to_thread`` would
+    let cancellation return while the thread is still running. The image
+    thread writes into the caller's temporary directory, which must not be
+    removed before the thread is done with it.
+    """
+    task = asyncio.ensure_future(asyncio.to_thread(func, *args))
+    try:
+        return await asyncio.shield(task)
+    except asyncio.CancelledError:
+        await asyncio.wait([task])
+        raise
+
+
+def _first_exception(group: BaseExceptionGroup) -> BaseException:
+    """Return the first leaf exception of a possibly nested group."""
+    first = group.exceptions[0]
+    if isinstance(first, BaseExceptionGroup):
+        return _first_exception(first)
+    return first
+
+
 async def run_pipeline(
     exam_pdf_path: Path,
     answer_key_pdf_path: Path | None,
@@ -65,38 +93,53 @@ async def run_pipeline(
 
     logger.info("Starting exam processing pipeline...")
 
-    logger.info("Extracting content from PDFs...")
-    exam_data = await asyncio.to_thread(
-        exam_extractor.extract_content,
-        exam_pdf_path=exam_pdf_path,
-        answer_key_pdf_path=answer_key_pdf_path,
-        images_output_dir=images_output_dir,
+    logger.info("Extracting text from PDFs...")
+    exam_text = await asyncio.to_thread(
+        exam_extractor.extract_exam_text,
+        exam_pdf_path,
+        answer_key_pdf_path,
     )
 
     logger.info("Cleaning text...")
-    cleaned_exam_text = text_processor.clean_text(exam_data["text"])
+    cleaned_exam_text = text_processor.clean_text(exam_text)
 
     logger.info("Splitting exam into exam content and answer key...")
     exam_text, answer_key_text = question_processor.split_answer_key(
         cleaned_exam_text
     )
 
-    logger.info("Splitting exam into question chunks...")
-    question_chunks = question_processor.split_into_questions(exam_text)
-
-    logger.info("Extracted %d question chunks.", len(question_chunks))
-
-    logger.info("Structuring questions using LLM...")
-    structured_questions = await question_processor.structure_questions(
-        "structure_questions/v4.md",
-        question_chunks,
-        answer_key_text,
-        exam_metadata,
-    )
+    # Image extraction only needs the PDF, so it runs while the LLM
+    # structures the questions instead of before it. Chunks are split
+    # lazily and sent to the LLM as they are produced. If either branch
+    # fails, the task group cancels the other one.
+    logger.info("Structuring questions and extracting images...")
+    try:
+        async with asyncio.TaskGroup() as tg:
+            structuring = tg.create_task(
+                question_processor.structure_questions(
+                    "structure_questions/v4.md",
+                    question_processor.iter_questions(exam_text),
+                    answer_key_text,
+                    exam_metadata,
+                )
+            )
+            mapping = tg.create_task(
+                _run_in_thread_to_completion(
+                    exam_extractor.map_images_to_questions,
+                    exam_pdf_path,
+                    images_output_dir,
+                )
+            )
+    except ExceptionGroup as group:
+        # Surface the underlying error rather than the group, so callers
+        # and the API error response see what actually went wrong.
+        raise _first_exception(group) from None
+    structured_questions = structuring.result()
+    images_map = mapping.result()
 
     logger.info("Attaching images to questions...")
     question_processor.attach_images_to_questions(
-        structured_questions, exam_data["images_map"]
+        structured_questions, images_map
     )
 
     exam = Exam(
@@ -106,7 +149,9 @@ async def run_pipeline(
 
     if output_path is not None:
         logger.info("Writing output to %s...", output_path)
-        await async_write_json(output_path, exam.model_dump())
+        # Serializing in pydantic-core skips building an intermediate dict
+        # tree; the output matches json.dumps(indent=4, ensure_ascii=False).
+        await async_write_text(output_path, exam.model_dump_json(indent=4))
 
     end = time.perf_counter()
 
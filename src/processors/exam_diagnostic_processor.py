@@ -3,7 +3,6 @@ import logging
 from asyncio import Semaphore
 from pathlib import Path
 
-import anyio
 import fitz
 from aiolimiter import AsyncLimiter
 from langchain_core.language_models.chat_models import BaseChatModel
@@ -15,6 +14,7 @@ from extractors.text_extractor import PDFTextExtractor
 from models.question import ExamProfile
 from prompts.loader import PromptLoader
 from utils.llm import load_google_generative_ai_model
+from utils.llm_output import parse_model_response, retry_delay
 
 logger = logging.getLogger(__name__)
 
@@ -35,6 +35,7 @@ class ExamDiagnosticProcessor:
             temperature=CONFIG.llm.temperature,
         )
         self.parser = JsonOutputParser(pydantic_object=ExamProfile)
+        self.format_instructions = self.parser.get_format_instructions()
         self.prompt = PromptLoader()
         rpm = requests_per_minute or CONFIG.llm.requests_per_minute
         concurrency = max_concurrent_requests or min(
@@ -66,6 +67,19 @@ class ExamDiagnosticProcessor:
             page_marker=None,
         )
 
+    def extract_samples(
+        self, exam_pdf_path: Path, answer_key_pdf_path: Path | None
+    ) -> tuple[str, str]:
+        """Extract the exam sample and, if present, the answer key sample."""
+
+        exam_sample = self.extract_sample(exam_pdf_path)
+
+        answer_sample = ""
+        if answer_key_pdf_path and answer_key_pdf_path.exists():
+            answer_sample = self.extract_sample(answer_key_pdf_path)
+
+        return exam_sample, answer_sample
+
     async def diagnose(
         self,
         prompt_path: str,
@@ -74,19 +88,18 @@ class ExamDiagnosticProcessor:
     ) -> ExamProfile | None:
         """Run diagnostic analysis on the extracted exam data."""
 
-        exam_sample = self.extract_sample(exam_pdf_path)
-
-        answer_sample = ""
-        if answer_key_pdf_path:
-            async_path = anyio.Path(answer_key_pdf_path)
-            if await async_path.exists():
-                answer_sample = self.extract_sample(answer_key_pdf_path)
+        # Both samples are taken in one worker thread: extraction is CPU
+        # bound and PyMuPDF is not thread safe, so the point is to keep the
+        # event loop free rather than to run the two in parallel.
+        exam_sample, answer_sample = await asyncio.to_thread(
+            self.extract_samples, exam_pdf_path, answer_key_pdf_path
+        )
 
         prompt = await self.prompt.async_load(
             prompt_path=prompt_path,
             exam_sample=exam_sample,
             answer_sample=answer_sample,
-            format_instructions=self.parser.get_format_instructions(),
+            format_instructions=self.format_instructions,
         )
 
         for attempt in range(1, self.max_retries + 1):
@@ -95,44 +108,38 @@ class ExamDiagnosticProcessor:
 
                 try:
                     response = await self.llm.ainvoke(prompt)
-                    content = response.content
-
-                    if not isinstance(content, str):
-                        content = str(content)
-
-                    parsed = self.parser.invoke(content)
-                    return ExamProfile.model_validate(parsed)
+                    # .text joins the text parts of multi-part responses;
+                    # str() on the list would yield its repr, not JSON.
+                    content = response.text
 
-                except (ValidationError, Exception) as e:
-                    is_validation_error = isinstance(e, ValidationError)
-                    error_type = (
-                        "ValidationError"
-                        if is_validation_error
-                        else "Exception"
+                    return parse_model_response(
+                        content, ExamProfile, self.parser
                     )
 
-                    if attempt < self.max_retries:
-                        delay = self.retry_base_delay * (2 ** (attempt - 1))
-                        logger.warning(
-                            "[Attempt %d/%d] %s: %s. Retrying in %.1fs...",
-                            attempt,
-                            self.max_retries,
-                            error_type,
-                            e,
-                            delay,
-                        )
-                        await asyncio.sleep(delay)
-                    else:
-                        logger.exception(
-                            "[Attempt %d/%d]: %s. Giving up.",
-                            attempt,
-                            self.max_retries,
-                            error_type,
-                        )
-                        if content:
-                            logger.debug(
-                                "LLM Response Content: %s",
-                                content[:500],
-                            )
+                except ValidationError as e:
+                    delay = retry_delay(
+                        attempt,
+                        "ValidationError",
+                        e,
+                        content,
+                        max_retries=self.max_retries,
+                        retry_base_delay=self.retry_base_delay,
+                    )
+                    if delay is None:
+                        return None
+                except Exception as e:
+                    delay = retry_delay(
+                        attempt,
+                        "Exception",
+                        e,
+                        content,
+                        max_retries=self.max_retries,
+                        retry_base_delay=self.retry_base_delay,
+                    )
+                    if delay is None:
                         return None
+
+            # Back off outside the gate so the concurrency slot is free for
+            # other requests while this one waits.
+            await asyncio.sleep(delay)
         return None
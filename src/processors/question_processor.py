@@ -2,6 +2,7 @@ import asyncio
 import logging
 import re
 from asyncio import Semaphore
+from collections.abc import Iterable, Iterator
 
 from aiolimiter import AsyncLimiter
 from langchain_core.language_models.chat_models import BaseChatModel
@@ -13,9 +14,13 @@ from models.question import ExamProfile, Question
 from prompts.loader import PromptLoader
 from utils.build_question_id import build_question_id, extract_question_number
 from utils.llm import load_google_generative_ai_model
+from utils.llm_output import parse_model_response, retry_delay
 
 logger = logging.getLogger(__name__)
 
+# Runs of three or more line breaks inside a question chunk
+_BLANK_LINES_RE = re.compile(r"\n{3,}")
+
 
 class QuestionProcessor:
     """Processes extracted questions for further analysis."""
@@ -43,31 +48,31 @@ class QuestionProcessor:
         )
 
         self.parser = JsonOutputParser(pydantic_object=Question)
+        self.format_instructions = self.parser.get_format_instructions()
         self.semaphore = Semaphore(concurrency)
         self.rate_limiter = AsyncLimiter(max_rate=rpm, time_period=60)
         self.max_retries = CONFIG.llm.max_retries
         self.retry_base_delay = CONFIG.llm.retry_base_delay
         self.prompt = PromptLoader()
 
-    def split_into_questions(self, text: str) -> list[str]:
-        """Split the exam text into chunks based on question delimiters.
+    def iter_questions(self, text: str) -> Iterator[str]:
+        """Yield question chunks from the exam text as they are found.
 
         Args:
             text: The full exam text.
 
-        Returns:
-            A list of question chunks.
+        Yields:
+            Each question chunk, header first.
         """
-        parts = self.re_question_split.split(text)
-        chunks: list[str] = []
-
-        for i in range(1, len(parts), 2):
-            if i + 1 < len(parts):
-                header = parts[i]
-                content = parts[i + 1]
-                clean_content = re.sub(r"\n{3,}", "\n\n", content.strip())
-                chunks.append(f"{header}\n{clean_content}")
-        return chunks
+        matches = self.re_question_split.finditer(text)
+        current = next(matches, None)
+        while current is not None:
+            following = next(matches, None)
+            end = following.start() if following is not None else len(text)
+            content = text[current.end() : end]
+            clean_content = _BLANK_LINES_RE.sub("\n\n", content.strip())
+            yield f"{current[1]}\n{clean_content}"
+            current = following
 
     def split_answer_key(self, text: str) -> tuple[str, str]:
         """Split the exam text into exam content and answer key.
@@ -102,14 +107,11 @@ class QuestionProcessor:
             dict: Representing the structured question data.
             None: If processing fails.
         """
-        if "QUESTÃO" not in chunk:
-            return None
-
         prompt = await self.prompt.async_load(
             prompt_path=prompt_path,
             chunk=chunk,
             answer_key_text=answer_key_text,
-            format_instructions=self.parser.get_format_instructions(),
+            format_instructions=self.format_instructions,
         )
 
         for attempt in range(1, self.max_retries + 1):
@@ -118,16 +120,16 @@ class QuestionProcessor:
 
                 try:
                     response = await self.llm.ainvoke(prompt)
-                    content = response.content
-
-                    if not isinstance(content, str):
-                        content = str(content)
-
-                    parsed = self.parser.invoke(content)
+                    # .text joins the text parts of multi-part responses;
+                    # str() on the list would yield its repr, not JSON.
+                    content = response.text
 
-                    question = Question.model_validate(parsed)
-
-                    question_id = build_question_id(
+                    question = parse_model_response(
+                        content, Question, self.parser
+                    )
+                    # The label comes from the LLM, so a missing question
+                    # number is retried like any other bad response.
+                    question.question_id = build_question_id(
                         exam_name_base=exam_metadata.exam_name_base,
                         exam_name_sigle=exam_metadata.exam_name_sigle,
                         exam_variant=exam_metadata.exam_variant,
@@ -137,71 +139,81 @@ class QuestionProcessor:
                         ),
                     )
 
-                    question.question_id = question_id
-                    return question.model_copy(
-                        update={"question_id": question_id}
+                except ValidationError as e:
+                    delay = retry_delay(
+                        attempt,
+                        "ValidationError",
+                        e,
+                        content,
+                        max_retries=self.max_retries,
+                        retry_base_delay=self.retry_base_delay,
                     )
-
-                except (ValidationError, Exception) as e:
-                    is_validation_error = isinstance(e, ValidationError)
-                    error_type = (
-                        "ValidationError"
-                        if is_validation_error
-                        else "Exception"
+                    if delay is None:
+                        return None
+                except Exception as e:
+                    delay = retry_delay(
+                        attempt,
+                        "Exception",
+                        e,
+                        content,
+                        max_retries=self.max_retries,
+                        retry_base_delay=self.retry_base_delay,
                     )
-
-                    if attempt < self.max_retries:
-                        delay = self.retry_base_delay * (2 ** (attempt - 1))
-                        logger.warning(
-                            "[Attempt %d/%d] %s: %s. Retrying in %.1fs...",
-                            attempt,
-                            self.max_retries,
-                            error_type,
-                            e,
-                            delay,
-                        )
-                        await asyncio.sleep(delay)
-                    else:
-                        logger.exception(
-                            "[Attempt %d/%d]: %s. Giving up.",
-                            attempt,
-                            self.max_retries,
-                            error_type,
-                        )
-                        if content:
-                            logger.debug(
-                                "LLM Response Content: %s",
-                                content[:500],
-                            )
+                    if delay is None:
                         return None
+                else:
+                    return question
+
+            # Back off outside the gate so the concurrency slot is free for
+            # other requests while this one waits.
+            await asyncio.sleep(delay)
         return None
 
     async def structure_questions(
         self,
         prompt_path: str,
-        question_chunks: list[str],
+        question_chunks: Iterable[str],
         answer_key_text: str,
         exam_metadata: ExamProfile,
     ) -> list[Question]:
         """Structure a list of question chunks using the LLM.
+
+        Each chunk is scheduled as soon as it is produced, so LLM requests
+        start while a lazy iterable such as iter_questions is still
+        splitting the text.
+
         Args:
-            question_chunks: List of question chunks to process.
+            question_chunks: Question chunks to process.
             answer_key_text: The answer key text for reference.
         Returns:
             list: List of structured question data dictionaries.
         """
 
-        results = await asyncio.gather(
-            *[
-                self.process_question_chunk(
-                    prompt_path,
-                    chunk,
-                    answer_key_text,
-                    exam_metadata,
+        # The task group cancels every scheduled chunk if this coroutine
+        # is cancelled, so no LLM request outlives a failed pipeline.
+        tasks: list[asyncio.Task[Question | None]] = []
+        async with asyncio.TaskGroup() as tg:
+            for chunk in question_chunks:
+                # Skip chunks without a question marker before creating a
+                # task.
+                if "QUESTÃO" not in chunk:
+                    continue
+                tasks.append(
+                    tg.create_task(
+                        self.process_question_chunk(
+                            prompt_path,
+                            chunk,
+                            answer_key_text,
+                            exam_metadata,
+                        )
+                    )
                 )
-                for chunk in question_chunks
-            ]
-        )
+                # Yield so the new task can issue its request right away.
+                await asyncio.sleep(0)
+
+            logger.info("Scheduled %d question chunks.", len(tasks))
+
+        results = [task.result() for task in tasks]
 
         valid_results = [res for res in results if res is not None]
 
@@ -228,9 +240,24 @@ class QuestionProcessor:
             question_image_map: Mapping of question identifiers to image URLs.
         """
 
+        # Index the images by question number once, so each question is a
+        # dict lookup instead of a scan over the whole map. If several names
+        # share a number, the first one in the map wins.
+        images_by_number: dict[int, list[str]] = {}
+        for q_name, images in question_image_map.items():
+            try:
+                number = extract_question_number(q_name)
+            except ValueError:
+                continue
+            images_by_number.setdefault(number, images)
+
         for question in structured_questions:
-            if question.image:
-                for q_name, images in question_image_map.items():
-                    if q_name in question.question:
-                        question.images = images
-                        break
+            if not question.image:
+                continue
+            try:
+                number = extract_question_number(question.question)
+            except ValueError:
+                continue
+            images = images_by_number.get(number)
+            if images is not None:
+                question.images = images
@@ -23,7 +23,7 @@ class TextProcessor:
             Cleaned text with repetitive patterns removed.
         """
 
-        return re.sub(self.clean_pattern, r"\1", text).strip()
+        return self.clean_pattern.sub(r"\1", text).strip()
 
     def clean_text(self, text: str) -> str:
         """Clean and normalize extracted text.
@@ -37,5 +37,8 @@ class TextProcessor:
         text = self.clean_repetitive_patterns(text)
 
         # Example cleaning: remove extra whitespace and normalize line breaks
-        lines = [line.strip() for line in text.splitlines() if line.strip()]
-        return "\n".join(lines)
+        return "\n".join(
+            stripped
+            for line in text.splitlines()
+            if (stripped := line.strip())
+        )
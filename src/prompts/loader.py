@@ -1,3 +1,4 @@
+import asyncio
 from pathlib import Path
 
 from langchain_core.prompts import PromptTemplate
@@ -6,10 +7,17 @@ from utils.file_operations import async_read_text
 
 
 class PromptLoader:
-    """Loads and formats prompt templates from files."""
+    """Loads and formats prompt templates from files.
+
+    Templates are read and parsed once per loader and cached by path, so
+    formatting the same prompt for every question chunk only substitutes
+    the variables.
+    """
 
     def __init__(self, base_path: Path = Path("src/prompts")) -> None:
         self.base_path = base_path
+        self._templates: dict[str, PromptTemplate] = {}
+        self._lock = asyncio.Lock()
 
     async def async_load(self, prompt_path: str, **variables: str) -> str:
         """Asynchronously load and format a prompt template from a file.
@@ -19,14 +27,17 @@ class PromptLoader:
         Returns:
             str: The formatted prompt string.
         """
-        full_path = self.base_path / prompt_path
-
-        template = await async_read_text(full_path)
-
-        prompt = PromptTemplate(
-            template=template,
-            input_variables=list(variables.keys()),
-        )
+        prompt = self._templates.get(prompt_path)
+        if prompt is None:
+            # Chunks are processed concurrently; the lock makes the first
+            # one read the file while the others wait for the cached copy.
+            async with self._lock:
+                prompt = self._templates.get(prompt_path)
+                if prompt is None:
+                    template = await async_read_text(
+                        self.base_path / prompt_path
+                    )
+                    prompt = self._cache(prompt_path, template)
 
         return prompt.format(**variables)
 
@@ -38,13 +49,15 @@ class PromptLoader:
         Returns:
             str: The formatted prompt string.
         """
-        full_path = self.base_path / prompt_path
-
-        template = full_path.read_text()
-
-        prompt = PromptTemplate(
-            template=template,
-            input_variables=list(variables.keys()),
-        )
+        prompt = self._templates.get(prompt_path)
+        if prompt is None:
+            template = (self.base_path / prompt_path).read_text()
+            prompt = self._cache(prompt_path, template)
 
         return prompt.format(**variables)
+
+    def _cache(self, prompt_path: str, template: str) -> PromptTemplate:
+        """Parse a template and cache it under its path."""
+        prompt = PromptTemplate.from_template(template)
+        self._templates[prompt_path] = prompt
+        return prompt
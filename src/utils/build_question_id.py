@@ -1,8 +1,37 @@
 import hashlib
 import re
 import unicodedata
-
-
+from functools import lru_cache
+
+# Padrões usados por _normalize_text
+_RE_SEPARATORS = re.compile(r"[--\-]")
+_RE_INVALID_CHARS = re.compile(r"[^a-z0-9_ ]")
+_RE_WHITESPACE = re.compile(r"\s+")
+_RE_UNDERSCORES = re.compile(r"_+")
+
+# Abreviações aplicadas por _compact_variant, em ordem
+_COMPACT_PATTERNS = [
+    (re.compile(r"(\d+)o?_dia"), r"d\1"),
+    (re.compile(r"(\d+)a?_fase"), r"f\1"),
+    (re.compile(r"tipo_(\w+)"), r"t\1"),
+    (re.compile(r"caderno_\d+(\w+)"), r"\1"),
+    (re.compile(r"caderno_(\w+)"), r"\1"),
+]
+
+# Padrões de extract_question_number, do mais específico ao mais genérico
+_QUESTION_NUMBER_PATTERNS = [
+    # "questao 01", "questao nº 7", "questao n 3"
+    re.compile(r"quest[ao]+\s*(?:n[o.]?\s*)?(\d+)"),
+    # "question 10", "question no. 5"
+    re.compile(r"question\s*(?:no?\.?\s*)?(\d+)"),
+    # "q. 5", "q.5", "q 5"
+    re.compile(r"q\.?\s*(\d+)"),
+    # Apenas número(s): "05", "12"
+    re.compile(r"(\d+)"),
+]
+
+
+@lru_cache(maxsize=256)
 def _normalize_text(text: str) -> str:
     """
     Remove acentos, converte para lowercase,
@@ -19,20 +48,21 @@ def _normalize_text(text: str) -> str:
     text = text.lower()
 
     # Substitui separadores por underscore
-    text = re.sub(r"[--\-]", "_", text)
+    text = _RE_SEPARATORS.sub("_", text)
 
     # Remove caracteres não alfanuméricos exceto underscore
-    text = re.sub(r"[^a-z0-9_ ]", "", text)
+    text = _RE_INVALID_CHARS.sub("", text)
 
     # Espaços para underscore
-    text = re.sub(r"\s+", "_", text)
+    text = _RE_WHITESPACE.sub("_", text)
 
     # Remove múltiplos underscores
-    text = re.sub(r"_+", "_", text)
+    text = _RE_UNDERSCORES.sub("_", text)
 
     return text.strip("_")
 
 
+@lru_cache(maxsize=256)
 def _compact_variant(variant: str) -> str:
     """
     Compacta termos comuns para tornar o ID mais curto.
@@ -44,21 +74,14 @@ def _compact_variant(variant: str) -> str:
 
     v = _normalize_text(variant)
 
-    patterns = [
-        (r"(\d+)o?_dia", r"d\1"),
-        (r"(\d+)a?_fase", r"f\1"),
-        (r"tipo_(\w+)", r"t\1"),
-        (r"caderno_\d+(\w+)", r"\1"),
-        (r"caderno_(\w+)", r"\1"),
-    ]
-
-    for pattern, replacement in patterns:
-        v = re.sub(pattern, replacement, v)
+    for pattern, replacement in _COMPACT_PATTERNS:
+        v = pattern.sub(replacement, v)
 
-    v = re.sub(r"_+", "_", v)
+    v = _RE_UNDERSCORES.sub("_", v)
     return v.strip("_")
 
 
+@lru_cache(maxsize=256)
 def extract_question_number(raw_label: str) -> int:
     """
     Extrai o número da questão a partir de um rótulo textual.
@@ -91,20 +114,8 @@ def extract_question_number(raw_label: str) -> int:
     text = text.encode("ascii", "ignore").decode("utf-8")
     text = text.strip().lower()
 
-    # Padrões ordenados do mais específico ao mais genérico
-    patterns = [
-        # "questao 01", "questao nº 7", "questao n 3"
-        r"quest[ao]+\s*(?:n[o.]?\s*)?(\d+)",
-        # "question 10", "question no. 5"
-        r"question\s*(?:no?\.?\s*)?(\d+)",
-        # "q. 5", "q.5", "q 5"
-        r"q\.?\s*(\d+)",
-        # Apenas número(s): "05", "12"
-        r"(\d+)",
-    ]
-
-    for pattern in patterns:
-        match = re.search(pattern, text)
+    for pattern in _QUESTION_NUMBER_PATTERNS:
+        match = pattern.search(text)
         if match:
             return int(match.group(1))
 
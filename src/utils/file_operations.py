@@ -37,15 +37,18 @@ async def async_write_json(
         data: Data to serialize as JSON
         indent: JSON indentation (default: 4)
         ensure_ascii: Whether to escape non-ASCII characters (default: False)
-        **kwargs: Additional arguments to pass to json.dump
+        **kwargs: Additional arguments to pass to json.dumps
     """
 
     def _write() -> None:
+        # Encoding to a string first lets the C encoder do all the work and
+        # the file be written in one call, instead of json.dump's many
+        # small writes from the pure-Python iterencode.
+        content = json.dumps(
+            data, indent=indent, ensure_ascii=ensure_ascii, **kwargs
+        )
         path.parent.mkdir(parents=True, exist_ok=True)
-        with path.open("w", encoding="utf-8") as f:
-            json.dump(
-                data, f, indent=indent, ensure_ascii=ensure_ascii, **kwargs
-            )
+        path.write_text(content, encoding="utf-8")
 
     await asyncio.to_thread(_write)
 
@@ -2,13 +2,19 @@
 
 This module provides utilities for loading and configuring
 Large Language Models.
+
+Loaders are memoized on their arguments, so repeated pipeline runs reuse
+the same client (and its HTTP session) instead of building a new one.
 """
 
+from functools import lru_cache
+
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_nvidia_ai_endpoints import ChatNVIDIA
 from langchain_ollama import ChatOllama
 
 
+@lru_cache(maxsize=8)
 def load_google_generative_ai_model(
     model_name: str = "gemini-2.5-pro",
     temperature: float = 0,
@@ -25,6 +31,7 @@ def load_google_generative_ai_model(
     return ChatGoogleGenerativeAI(model=model_name, temperature=temperature)
 
 
+@lru_cache(maxsize=8)
 def load_ollama_model(
     model_name: str,
     temperature: float = 0,
@@ -41,6 +48,7 @@ def load_ollama_model(
     return ChatOllama(model=model_name, temperature=temperature)
 
 
+@lru_cache(maxsize=8)
 def load_nvidia_model(
     model_name: str,
     temperature: float = 0,
@@ -0,0 +1,88 @@
+"""Utilities to parse LLM responses and retry failed LLM calls."""
+
+import logging
+import re
+
+from langchain_core.output_parsers import JsonOutputParser
+from pydantic import BaseModel, ValidationError
+
+logger = logging.getLogger(__name__)
+
+# Markdown code fence wrapped around a JSON response
+_FENCE_RE = re.compile(r"^\s*```(?:json)?\s*|\s*```\s*$")
+
+
+def parse_model_response[ModelT: BaseModel](
+    content: str,
+    model: type[ModelT],
+    parser: JsonOutputParser,
+) -> ModelT:
+    """Parse an LLM response into the given model.
+
+    Well-formed JSON, optionally wrapped in a markdown fence, is parsed
+    and validated in a single pass by pydantic-core. Anything else falls
+    back to the more lenient output parser.
+
+    Args:
+        content: The raw LLM response text.
+        model: The Pydantic model to validate against.
+        parser: Output parser used when the fast path fails.
+
+    Returns:
+        The validated model instance.
+
+    Raises:
+        ValidationError: If the response does not describe a valid model.
+    """
+    try:
+        return model.model_validate_json(_FENCE_RE.sub("", content))
+    except ValidationError:
+        return model.model_validate(parser.invoke(content))
+
+
+def retry_delay(  # noqa: PLR0913
+    attempt: int,
+    error_type: str,
+    error: Exception,
+    content: str | None,
+    *,
+    max_retries: int,
+    retry_base_delay: float,
+) -> float | None:
+    """Log a failed LLM attempt and compute the backoff before the next.
+
+    Args:
+        attempt: The 1-based number of the attempt that failed.
+        error_type: Label for the kind of failure, used in the logs.
+        error: The exception raised by the attempt.
+        content: The raw LLM response, if one was received.
+        max_retries: The total number of attempts allowed.
+        retry_base_delay: Delay in seconds after the first failure; it
+            doubles after each further one.
+
+    Returns:
+        The delay in seconds before retrying, or None if no attempts
+        are left.
+    """
+    if attempt < max_retries:
+        delay = retry_base_delay * (2 ** (attempt - 1))
+        logger.warning(
+            "[Attempt %d/%d] %s: %s. Retrying in %.1fs...",
+            attempt,
+            max_retries,
+            error_type,
+            error,
+            delay,
+        )
+        return delay
+
+    logger.error(
+        "[Attempt %d/%d]: %s. Giving up.",
+        attempt,
+        max_retries,
+        error_type,
+        exc_info=error,
+    )
+    if content:
+        logger.debug("LLM Response Content: %s", content[:500])
+    return None
@@ -0,0 +1,79 @@
+import os
+from collections.abc import Iterator
+from io import BytesIO
+from pathlib import Path
+
+import fitz
+import pytest
+from PIL import Image
+
+from extractors.image_extractor import (
+    _MIN_IMAGES_FOR_POOL,
+    PDFImageExtractor,
+    shutdown_pool,
+)
+
+IMAGE_COUNT = _MIN_IMAGES_FOR_POOL + 3
+
+
+@pytest.fixture(scope="module")
+def pdf_path(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """A PDF with one distinct noise image per page."""
+    path = tmp_path_factory.mktemp("pdf") / "images.pdf"
+    with fitz.open() as doc:
+        for _ in range(IMAGE_COUNT):
+            buffer = BytesIO()
+            Image.frombytes("RGB", (320, 320), os.urandom(320 * 320 * 3)).save(
+                buffer, format="PNG"
+            )
+            page = doc.new_page()
+            page.insert_image(
+                fitz.Rect(50, 50, 370, 370), stream=buffer.getvalue()
+            )
+        doc.save(path)
+    return path
+
+
+@pytest.fixture(scope="module", autouse=True)
+def _stop_pool() -> Iterator[None]:
+    yield
+    shutdown_pool()
+
+
+def extract(
+    pdf_path: Path, output_dir: Path, max_workers: int
+) -> list[str | None]:
+    with fitz.open(pdf_path) as doc:
+        xrefs = [page.get_images()[0][0] for page in doc.pages()]
+
+    # The first image also belongs to a second question, so the results
+    # have to be mapped back to more than one position per xref.
+    candidates = [
+        (xref, f"QUESTÃO {number:02d}")
+        for number, xref in enumerate(xrefs, start=1)
+    ]
+    candidates.append((xrefs[0], f"QUESTÃO {len(xrefs) + 1:02d}"))
+    image_counts = dict.fromkeys(xrefs, 1)
+
+    output_dir.mkdir()
+    extractor = PDFImageExtractor(max_workers=max_workers)
+    return extractor.extract_and_filter_images(
+        pdf_path, candidates, image_counts, output_dir
+    )
+
+
+def test_pool_results_match_inline(pdf_path: Path, tmp_path: Path) -> None:
+    inline = extract(pdf_path, tmp_path / "inline", max_workers=1)
+    pooled = extract(pdf_path, tmp_path / "pooled", max_workers=4)
+
+    assert len(inline) == IMAGE_COUNT + 1
+    assert all(inline)
+    assert pooled == inline
+
+    inline_files = sorted(p.name for p in (tmp_path / "inline").iterdir())
+    pooled_files = sorted(p.name for p in (tmp_path / "pooled").iterdir())
+    assert pooled_files == inline_files
+    for name in inline_files:
+        assert (tmp_path / "pooled" / name).read_bytes() == (
+            tmp_path / "inline" / name
+        ).read_bytes()
@@ -0,0 +1,39 @@
+import re
+
+from processors.question_processor import QuestionProcessor
+
+
+def split_with_re_split(pattern: re.Pattern[str], text: str) -> list[str]:
+    """The re.split based splitting that iter_questions replaced."""
+    parts = pattern.split(text)
+    chunks: list[str] = []
+
+    for i in range(1, len(parts), 2):
+        if i + 1 < len(parts):
+            header = parts[i]
+            content = parts[i + 1]
+            clean_content = re.sub(r"\n{3,}", "\n\n", content.strip())
+            chunks.append(f"{header}\n{clean_content}")
+    return chunks
+
+
+def test_iter_questions_matches_re_split() -> None:
+    processor = QuestionProcessor()
+
+    text = (
+        "Caderno de prova\nLeia as instruções.\n\n"
+        "QUESTÃO 01\nEnunciado um.\n\n\n\nA) sim\nB) não\n"
+        "questão 02 Enunciado dois.\n\n\n\n\n"
+        "QUESTÃO 03\n\n\n\nEnunciado três.\n"
+        "QUESTÃO 04"
+    )
+
+    chunks = list(processor.iter_questions(text))
+
+    assert chunks == split_with_re_split(processor.re_question_split, text)
+    assert chunks == [
+        "QUESTÃO 01\nEnunciado um.\n\nA) sim\nB) não",
+        "questão 02\nEnunciado dois.",
+        "QUESTÃO 03\nEnunciado três.",
+        "QUESTÃO 04\n",
+    ]
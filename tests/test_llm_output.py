@@ -0,0 +1,44 @@
+import pytest
+from langchain_core.output_parsers import JsonOutputParser
+from pydantic import BaseModel, ValidationError
+
+from utils.llm_output import parse_model_response
+
+
+class Answer(BaseModel):
+    label: str
+    score: int
+
+
+PARSER = JsonOutputParser(pydantic_object=Answer)
+
+
+def test_parses_bare_json() -> None:
+    answer = parse_model_response('{"label": "A", "score": 3}', Answer, PARSER)
+
+    assert answer == Answer(label="A", score=3)
+
+
+def test_parses_json_in_markdown_fence() -> None:
+    content = '```json\n{"label": "B", "score": 1}\n```'
+
+    answer = parse_model_response(content, Answer, PARSER)
+
+    assert answer == Answer(label="B", score=1)
+
+
+def test_falls_back_to_parser_for_prose_around_json() -> None:
+    content = (
+        "Here is the structured question:\n"
+        '```json\n{"label": "C", "score": 2}\n```\n'
+        "Let me know if you need anything else."
+    )
+
+    answer = parse_model_response(content, Answer, PARSER)
+
+    assert answer == Answer(label="C", score=2)
+
+
+def test_raises_for_schema_invalid_json() -> None:
+    with pytest.raises(ValidationError):
+        parse_model_response('{"label": "D"}', Answer, PARSER)